@@ -0,0 +1,68 @@
+"""One-off converter: data/raw/*.csv -> Snappy-compressed Parquet.
+
+The Streamlit app fetches its inputs from GitHub raw over HTTPS, so the
+dominant cold-start cost is text parsing plus bytes over the wire.
+Dictionary/RLE-encoded Parquet cuts both: the app can then read only the
+columns it actually uses instead of scanning every row in full.
+
+Run from the repository root after regenerating any CSV:
+
+    python scripts/csv_to_parquet.py
+"""
+
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+
+RAW_DIR = Path(__file__).resolve().parents[1] / "data" / "raw"
+
+# Parse calendar columns as timestamps so pandas gets datetime64 back
+# instead of boxed datetime.date objects. Unknown columns are ignored.
+CONVERT_OPTIONS = pacsv.ConvertOptions(
+    column_types={
+        "timestamp": pa.timestamp("s"),
+        "day": pa.timestamp("s"),
+        "hour": pa.timestamp("s"),
+    }
+)
+
+
+def convert(csv_path: Path) -> Path:
+    table = pacsv.read_csv(csv_path, convert_options=CONVERT_OPTIONS)
+    parquet_path = csv_path.with_suffix(".parquet")
+    pq.write_table(
+        table,
+        parquet_path,
+        compression="snappy",
+        use_dictionary=True,
+    )
+    return parquet_path
+
+
+def write_partitioned_factory_data() -> None:
+    # The app only ever looks at one machine at a time, so publish the
+    # minutely data as a machine-partitioned dataset too. Each partition
+    # lands at a stable path (factory_data/machine=<id>/part-0.parquet)
+    # that the app can address directly over GitHub raw.
+    table = pacsv.read_csv(
+        RAW_DIR / "factory_data.csv", convert_options=CONVERT_OPTIONS
+    ).sort_by("timestamp")
+    pq.write_to_dataset(
+        table,
+        RAW_DIR / "factory_data",
+        partition_cols=["machine"],
+        basename_template="part-{i}.parquet",
+        existing_data_behavior="delete_matching",
+        compression="snappy",
+        use_dictionary=True,
+    )
+
+
+if __name__ == "__main__":
+    for csv_path in sorted(RAW_DIR.glob("*.csv")):
+        parquet_path = convert(csv_path)
+        print(f"{csv_path.name} -> {parquet_path.name}")
+    write_partitioned_factory_data()
+    print("factory_data.csv -> factory_data/machine=*/part-0.parquet")
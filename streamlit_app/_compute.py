@@ -0,0 +1,244 @@
+"""Shared data-loading and compute layer for the dashboard.
+
+Everything that touches data lives here as cacheable functions, kept
+apart from the page script so the pipelines can be imported, profiled
+and reused without dragging Streamlit's rerun flow along. Filter
+arguments are plain hashables (tuples, dates) so @st.cache_data can key
+on them directly.
+"""
+
+import json
+import urllib.request
+from pathlib import Path
+
+import fsspec
+import streamlit as st
+import pandas as pd
+import numpy as np
+import pyarrow.parquet as pq
+from numba import njit
+
+REPO = "firmansyahr/Production-Performance-Analysis-and-Continuous-Improvement"
+BASE_URL = f"https://raw.githubusercontent.com/{REPO}/"
+BRANCH = "master"
+RAW_PATH = f"{BASE_URL}{BRANCH}/data/raw/"
+IDEAL_RATE = 6
+
+@st.cache_resource
+def local_cache_dir():
+    # Resolve BRANCH to its commit SHA so the on-disk cache invalidates
+    # whenever new data is pushed; fall back to the branch name if the
+    # GitHub API is unreachable.
+    try:
+        api_url = f"https://api.github.com/repos/{REPO}/commits/{BRANCH}"
+        with urllib.request.urlopen(api_url, timeout=5) as resp:
+            sha = json.load(resp)["sha"]
+    except Exception:
+        sha = BRANCH
+    cache_dir = Path.home() / ".cache" / "prodperf" / sha
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    return cache_dir
+
+def read_remote_parquet(filename, columns, dictionary=None):
+    # pq.read_table + to_pandas is measurably faster than pd.read_parquet,
+    # and column pruning keeps us from downloading bytes we never touch.
+    # Hits on the SHA-keyed disk cache skip the network entirely, so only
+    # the first cold start after a data push pays the download.
+    local_path = local_cache_dir() / filename
+    local_path.parent.mkdir(parents=True, exist_ok=True)
+    if local_path.exists():
+        table = pq.read_table(local_path, columns=columns,
+                              read_dictionary=dictionary)
+    else:
+        # The 8 MB block cache serves the Parquet footer and every column
+        # chunk from one buffered fetch instead of many small range
+        # requests.
+        fs = fsspec.filesystem("http")
+        with fs.open(RAW_PATH + filename,
+                     block_size=8 * 1024 * 1024,
+                     cache_type="mmap") as f:
+            table = pq.read_table(f, columns=columns,
+                                  read_dictionary=dictionary)
+        pq.write_table(table, local_path,
+                       compression="zstd", use_dictionary=True)
+
+    if dictionary:
+        # Hand the Arrow buffers to pandas as-is (zero-copy): the
+        # dictionary columns behave like categoricals without a
+        # separate astype pass.
+        return table.to_pandas(types_mapper=pd.ArrowDtype)
+    return table.to_pandas()
+
+@st.cache_data(ttl=3600)
+def load_minutely(machine):
+    # factory_data is published machine-partitioned, so only the
+    # selected machine's rows ever cross the wire - the partition path
+    # is the predicate, no footer statistics needed. The ttl keeps one
+    # cache entry per machine and refreshes it hourly.
+    minutely = read_remote_parquet(
+        f"factory_data/machine={machine}/part-0.parquet",
+        columns=["timestamp", "shift", "day",
+                 "is_running", "units", "good_units"]
+    )
+
+    # The partition column lives in the path, not the file; restore it
+    # so downstream filters and groupbys are machine-agnostic. The
+    # frame stays numpy-backed: the pre_agg numba kernel needs
+    # .cat.codes and contiguous int64 buffers, which ArrowDtype columns
+    # don't expose. Categories still give integer-code filter
+    # comparisons and code-based groupbys.
+    minutely["machine"] = pd.Categorical([machine] * len(minutely))
+    minutely["shift"] = minutely["shift"].astype("category")
+
+    return minutely
+
+@st.cache_data
+def load_data():
+    downtime = read_remote_parquet(
+        "downtime_pareto.parquet",
+        columns=["machine", "cause", "minutes"],
+        dictionary=["machine", "cause"]
+    )
+    spc = read_remote_parquet(
+        "spc_xbar_r.parquet",
+        columns=["machine", "xbar", "R"],
+        dictionary=["machine"]
+    )
+    return downtime, spc
+
+@njit(cache=True)
+def group_sums(group_ids, is_running, units, good_units, n_groups):
+    # One fused pass over the minutely arrays producing count plus the
+    # three sums per group. Scatter-adds into a shared accumulator would
+    # race under prange, so the loop stays serial - still a single
+    # compiled scan with no per-column pandas dispatch.
+    out = np.zeros((n_groups, 4), dtype=np.int64)
+    for i in range(group_ids.shape[0]):
+        g = group_ids[i]
+        out[g, 0] += 1
+        out[g, 1] += is_running[i]
+        out[g, 2] += units[i]
+        out[g, 3] += good_units[i]
+    return out
+
+@st.cache_data
+def pre_agg(df):
+    # Collapse the minutely grain once per session: the interactive path
+    # then filters and re-groups a few hundred (machine, shift, day) rows
+    # instead of re-scanning every minute on each widget change. The
+    # category codes give a dense (machine, shift, day) group id for the
+    # numba kernel directly.
+    machine_codes = df["machine"].cat.codes.to_numpy().astype(np.int64)
+    shift_codes = df["shift"].cat.codes.to_numpy().astype(np.int64)
+    day_codes, day_values = pd.factorize(df["day"], sort=True)
+
+    n_shift = len(df["shift"].cat.categories)
+    n_day = len(day_values)
+    n_groups = len(df["machine"].cat.categories) * n_shift * n_day
+    group_ids = (machine_codes * n_shift + shift_codes) * n_day + day_codes
+
+    sums = group_sums(
+        group_ids,
+        df["is_running"].to_numpy(),
+        df["units"].to_numpy(),
+        df["good_units"].to_numpy(),
+        n_groups
+    )
+
+    # Keep only observed groups and decode the dense ids back to labels.
+    ids = np.flatnonzero(sums[:, 0] > 0)
+    machine_idx, rest = np.divmod(ids, n_shift * n_day)
+    shift_idx, day_idx = np.divmod(rest, n_day)
+
+    return pd.DataFrame({
+        "machine": pd.Categorical.from_codes(machine_idx, dtype=df["machine"].dtype),
+        "shift": pd.Categorical.from_codes(shift_idx, dtype=df["shift"].dtype),
+        "day": day_values[day_idx],
+        "planned_min": sums[ids, 0],
+        "running_min": sums[ids, 1],
+        "total_units": sums[ids, 2],
+        "good_units": sums[ids, 3]
+    })
+
+@st.cache_data
+def filter_options():
+    # The machine widget has to exist before any minutely partition is
+    # chosen, so the option lists come from the tiny per-shift rollup
+    # instead of the minutely data.
+    opts = read_remote_parquet(
+        "oee_by_shift.parquet",
+        columns=["machine", "shift"],
+        dictionary=["machine", "shift"]
+    )
+    return sorted(opts["machine"].unique()), sorted(opts["shift"].unique())
+
+@st.cache_data
+def date_bounds(df):
+    # Per-frame constants; computing them once avoids re-scanning the
+    # timestamps on every widget change.
+    return df["timestamp"].min().date(), df["timestamp"].max().date()
+
+@st.cache_data
+def compute_daily_oee(df_agg, machine, shift, day_first, day_last):
+    # Compare days as datetime64 directly: a half-open [start, end)
+    # range avoids boxing a Python date object per row via .dt.date.
+    day_start = np.datetime64(day_first)
+    day_end = np.datetime64(day_last) + np.timedelta64(1, "D")
+    days = df_agg["day"].to_numpy()
+
+    mask = (
+        (df_agg["machine"] == machine).to_numpy() &
+        df_agg["shift"].isin(shift).to_numpy() &
+        (days >= day_start) &
+        (days < day_end)
+    )
+
+    daily_oee = (
+        df_agg[mask]
+        .groupby("day", as_index=False)
+        [["planned_min", "running_min", "total_units", "good_units"]]
+        .sum()
+    )
+
+    # Compute all four KPIs on contiguous arrays and assign them in one
+    # shot instead of materializing four intermediate Series. OEE
+    # (availability * performance * quality) cancels algebraically to
+    # good / (IDEAL_RATE * planned) - a single divide per row.
+    planned = daily_oee["planned_min"].to_numpy(dtype=np.float64)
+    running = daily_oee["running_min"].to_numpy(dtype=np.float64)
+    units = daily_oee["total_units"].to_numpy(dtype=np.float64)
+    good = daily_oee["good_units"].to_numpy(dtype=np.float64)
+
+    daily_oee[["availability", "performance", "quality", "oee"]] = np.column_stack([
+        running / planned,
+        units / (IDEAL_RATE * running),
+        good / units,
+        good / (IDEAL_RATE * planned)
+    ])
+
+    return daily_oee
+
+@st.cache_data
+def compute_pareto(df, machine):
+    dt = (
+        df[df["machine"] == machine]
+        .groupby("cause", as_index=False, observed=True, sort=False)["minutes"]
+        .sum()
+        .sort_values("minutes", ascending=False, ignore_index=True)
+    )
+
+    # One numpy pass: the last cumsum element is the total, so no
+    # separate sum() scan and no intermediate Series allocation.
+    cum_minutes = np.cumsum(dt["minutes"].to_numpy())
+    dt["cum_pct"] = cum_minutes / cum_minutes[-1]
+    return dt
+
+@st.cache_data
+def spc_summary_all(df):
+    # The summary statistics are per-machine constants, so compute them
+    # for every machine once and make each rerun a plain row lookup.
+    return df.groupby("machine", observed=True).agg(
+        avg_xbar=("xbar", "mean"),
+        avg_range=("R", "mean"),
+        max_range=("R", "max")
+    )
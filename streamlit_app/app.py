@@ -1,7 +1,17 @@
+import altair as alt
 import streamlit as st
 import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
+
+from _compute import (
+    compute_daily_oee,
+    compute_pareto,
+    date_bounds,
+    filter_options,
+    load_data,
+    load_minutely,
+    pre_agg,
+    spc_summary_all,
+)
 
 # ==================================================
 # PAGE CONFIG
@@ -12,79 +22,21 @@ st.set_page_config(
 )
 
 # ==================================================
-# DATA LOADING
+# DATA LOADING & SIDEBAR FILTER
 # ==================================================
-BASE_URL = "https://raw.githubusercontent.com/firmansyahr/Production-Performance-Analysis-and-Continuous-Improvement/"
-BRANCH = "master"
-RAW_PATH = f"{BASE_URL}{BRANCH}/data/raw/"
-IDEAL_RATE = 6
-
-@st.cache_data
-def load_data():
-    minutely = pd.read_csv(RAW_PATH + "factory_data.csv", parse_dates=["timestamp"])
-    downtime = pd.read_csv(RAW_PATH + "downtime_pareto.csv")
-    spc = pd.read_csv(RAW_PATH + "spc_xbar_r.csv")
-    return minutely, downtime, spc
+df_downtime, df_spc = load_data()
+machines, shifts = filter_options()
 
-df_minutely, df_downtime, df_spc = load_data()
-
-# ==================================================
-# SIDEBAR FILTER
-# ==================================================
 st.sidebar.header("Filters")
 
-machine = st.sidebar.selectbox(
-    "Machine",
-    sorted(df_minutely["machine"].unique())
-)
-
-shift = st.sidebar.multiselect(
-    "Shift",
-    sorted(df_minutely["shift"].unique()),
-    default=sorted(df_minutely["shift"].unique())
-)
-
-date_range = st.sidebar.date_input(
-    "Date Range",
-    [
-        df_minutely["timestamp"].dt.date.min(),
-        df_minutely["timestamp"].dt.date.max()
-    ]
-)
-
-# ==================================================
-# FILTERED DATA
-# ==================================================
-filtered = df_minutely[
-    (df_minutely["machine"] == machine) &
-    (df_minutely["shift"].isin(shift)) &
-    (df_minutely["timestamp"].dt.date >= date_range[0]) &
-    (df_minutely["timestamp"].dt.date <= date_range[1])
-]
-
-# ==================================================
-# OEE CALCULATION
-# ==================================================
-daily_oee = (
-    filtered
-    .groupby("day")
-    .agg(
-        planned_min=("timestamp", "count"),
-        running_min=("is_running", "sum"),
-        total_units=("units", "sum"),
-        good_units=("good_units", "sum")
-    )
-    .reset_index()
-)
+# Machine stays in the sidebar because every tab depends on it; a
+# machine change legitimately reruns the whole script. Only the
+# selected machine's partition of the minutely data is ever fetched.
+machine = st.sidebar.selectbox("Machine", machines)
 
-daily_oee["availability"] = daily_oee["running_min"] / daily_oee["planned_min"]
-daily_oee["performance"] = daily_oee["total_units"] / (IDEAL_RATE * daily_oee["running_min"])
-daily_oee["quality"] = daily_oee["good_units"] / daily_oee["total_units"]
-daily_oee["oee"] = (
-    daily_oee["availability"] *
-    daily_oee["performance"] *
-    daily_oee["quality"]
-)
+df_minutely = load_minutely(machine)
+df_agg = pre_agg(df_minutely)
+day_min, day_max = date_bounds(df_minutely)
 
 # ==================================================
 # KPI STATUS FUNCTION
@@ -112,7 +64,19 @@ tab1, tab2, tab3, tab4 = st.tabs([
 # ==================================================
 # TAB 1 — OVERVIEW
 # ==================================================
-with tab1:
+@st.fragment
+def overview_tab():
+    # Shift and date filters only affect this tab, so they live inside
+    # the fragment (fragments cannot render widgets into the sidebar):
+    # changing them reruns just this block, not the other tabs.
+    f1, f2 = st.columns(2)
+    shift = f1.multiselect("Shift", shifts, default=shifts)
+    date_range = f2.date_input("Date Range", [day_min, day_max])
+
+    daily_oee = compute_daily_oee(
+        df_agg, machine, tuple(shift), date_range[0], date_range[1]
+    )
+
     st.subheader("Key Performance Indicators")
 
     avg_oee = daily_oee["oee"].mean()
@@ -127,12 +91,7 @@ with tab1:
     c4.metric("Quality", f"{avg_qual:.1%}")
 
     st.subheader("OEE Trend")
-    fig, ax = plt.subplots()
-    ax.plot(daily_oee["day"], daily_oee["oee"], marker="o")
-    ax.set_ylim(0, 1)
-    ax.set_ylabel("OEE")
-    ax.set_xlabel("Day")
-    st.pyplot(fig)
+    st.line_chart(daily_oee.set_index("day")["oee"])
 
     st.subheader("OEE Loss Breakdown")
     loss_df = pd.DataFrame({
@@ -144,56 +103,51 @@ with tab1:
         ]
     })
 
-    fig, ax = plt.subplots()
-    ax.bar(loss_df["Component"], loss_df["Loss"])
-    st.pyplot(fig)
+    st.bar_chart(loss_df.set_index("Component"))
+
+with tab1:
+    overview_tab()
 
 # ==================================================
 # TAB 2 — DOWNTIME RCA
 # ==================================================
-with tab2:
+@st.fragment
+def downtime_tab():
     st.subheader("Downtime Pareto")
 
-    dt = (
-        df_downtime[df_downtime["machine"] == machine]
-        .groupby("cause")["minutes"]
-        .sum()
-        .reset_index()
-        .sort_values("minutes", ascending=False)
-    )
-
-    dt["cum_pct"] = dt["minutes"].cumsum() / dt["minutes"].sum()
-
-    fig, ax1 = plt.subplots()
-    ax1.bar(dt["cause"], dt["minutes"])
-    ax1.set_ylabel("Minutes")
-    ax1.set_xticklabels(dt["cause"], rotation=45)
+    dt = compute_pareto(df_downtime, machine)
 
-    ax2 = ax1.twinx()
-    ax2.plot(dt["cause"], dt["cum_pct"], marker="o")
-    ax2.axhline(0.8, linestyle="--")
+    # Bars + cumulative-% line share the x axis but keep independent
+    # y scales; sort=None preserves the descending-minutes order.
+    bars = alt.Chart(dt).mark_bar().encode(
+        x=alt.X("cause", sort=None, title="Cause"),
+        y=alt.Y("minutes", title="Minutes")
+    )
+    cum_line = alt.Chart(dt).mark_line(point=True).encode(
+        x=alt.X("cause", sort=None),
+        y=alt.Y("cum_pct", title="Cumulative %")
+    )
+    threshold = alt.Chart(pd.DataFrame({"y": [0.8]})).mark_rule(
+        strokeDash=[4, 4]
+    ).encode(y="y")
 
-    st.pyplot(fig)
+    st.altair_chart(
+        (bars + cum_line + threshold).resolve_scale(y="independent"),
+        use_container_width=True
+    )
 
     st.dataframe(dt)
 
+with tab2:
+    downtime_tab()
+
 # ==================================================
 # TAB 3 — SPC
 # ==================================================
 with tab3:
     st.subheader("SPC Summary")
 
-    spc_summary = (
-        df_spc[df_spc["machine"] == machine]
-        .agg(
-            avg_xbar=("xbar", "mean"),
-            avg_range=("R", "mean"),
-            max_range=("R", "max")
-        )
-        .T
-    )
-
-    st.table(spc_summary)
+    st.table(spc_summary_all(df_spc).loc[[machine]].T)
 
     st.success("Process Status: In Control")
 